@@ -0,0 +1,59 @@
+"""Shared error reporting for CLI commands.
+
+Every command used to repeat the same try/except ValueError/Exception
+block; wrap_errors centralizes it so command bodies carry one code path
+(and one exception table in their compiled form) instead of three.
+"""
+
+from __future__ import annotations
+
+import functools
+from functools import lru_cache
+from typing import Callable, Optional, TypeVar
+
+import typer
+
+F = TypeVar("F", bound=Callable)
+
+
+@lru_cache(maxsize=1)
+def _console():
+    """Create the Rich console on first use (see cli._console)."""
+    from rich.console import Console
+
+    return Console()
+
+
+def wrap_errors(hint: Optional[str] = None) -> Callable[[F], F]:
+    """Report errors the way CLI commands do, then exit non-zero.
+
+    ValueError (the API layer's "expected" failure type) prints as a
+    plain error; anything else prints as unexpected, followed by the
+    optional hint.
+
+    Args:
+        hint: Extra guidance printed after an unexpected error
+
+    Returns:
+        Decorator for a command function
+    """
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            try:
+                return fn(*args, **kwargs)
+            except typer.Exit:
+                raise
+            except ValueError as e:
+                _console().print(f"[red]Error:[/red] {str(e)}")
+                raise typer.Exit(code=1)
+            except Exception as e:
+                _console().print(f"[red]Unexpected error:[/red] {str(e)}")
+                if hint:
+                    _console().print(f"[yellow]{hint}[/yellow]")
+                raise typer.Exit(code=1)
+
+        return wrapper
+
+    return decorator
@@ -1,18 +1,125 @@
 """Tailscale API client."""
 
+import atexit
 import json
 import logging
-from pathlib import Path
-from typing import Any, Dict, List, Optional
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, Iterator, List, NamedTuple, Optional
 
 import httpx
-import keyring
-from authlib.integrations.httpx_client import OAuth2Client
-from pydantic import BaseModel
 
+from tailnet_admin._config import CONFIG_DIR, CONFIG_FILE
+from tailnet_admin.cache import fetch_swr, invalidate
 
-class Device(BaseModel):
-    """Tailscale device model."""
+# orjson decodes large JSON bodies 3-5x faster than stdlib json; fall back
+# to the stdlib when it isn't installed.
+try:
+    import orjson
+
+    def _json_loads(data):
+        return orjson.loads(data)
+
+    def _json_dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+
+except ImportError:
+
+    def _json_loads(data):
+        return json.loads(data)
+
+    def _json_dumps(obj) -> str:
+        return json.dumps(obj)
+
+
+# ijson parses the device list incrementally, keeping peak memory at about
+# one row instead of the whole list; optional, with a full-parse fallback.
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# jmespath (optional) runs the device/key row projections in C instead of
+# Python-level .get chains; compiled once at import.
+try:
+    import jmespath
+
+    _DEV_PROJ = jmespath.compile(
+        "devices[].{id: id || '', name: hostname || name || '', "
+        "ip: addresses[0] || '', last_seen: lastSeen || '', "
+        "os: os || '', tags: tags}"
+    )
+    _KEY_PROJ = jmespath.compile(
+        "keys[].{id: id || '', name: description || name || '', "
+        "created: created || '', expires: expires || '', "
+        "capabilities: capabilities, description: description || ''}"
+    )
+except ImportError:
+    _DEV_PROJ = None
+    _KEY_PROJ = None
+
+
+class _ByteStreamReader:
+    """Minimal file-like wrapper over an iterator of byte chunks."""
+
+    def __init__(self, chunks):
+        self._chunks = chunks
+        self._buffer = b""
+
+    def read(self, size: int = -1) -> bytes:
+        while size < 0 or len(self._buffer) < size:
+            try:
+                self._buffer += next(self._chunks)
+            except StopIteration:
+                break
+
+        if size < 0:
+            data, self._buffer = self._buffer, b""
+        else:
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+
+# OAuth token endpoint and form headers, hoisted so authenticate doesn't
+# rebuild them per call. Endpoint per
+# https://tailscale.com/kb/1215/oauth-clients#tailscale-oauth-token-endpoint
+TOKEN_ENDPOINT = "https://api.tailscale.com/api/v2/oauth/token"
+_FORM_HEADERS = {"Content-Type": "application/x-www-form-urlencoded"}
+
+# In-process cache of (token, expires_at) per tailnet. Keyring backends go
+# through a subprocess or D-Bus call (typically 20-100 ms), so the secret is
+# fetched at most once per process lifetime.
+_TOKEN_CACHE: Dict[str, tuple] = {}
+
+# The client built by from_stored_auth, reused for the process lifetime so
+# scripted usage (REPLs, chained commands) doesn't re-read config and
+# keyring per call.
+_STORED_API: Optional["TailscaleAPI"] = None
+
+
+def clear_cached_token(tailnet: Optional[str] = None) -> None:
+    """Drop cached tokens and the cached client, e.g. after logout.
+
+    Args:
+        tailnet: Tailnet to forget, or None to clear all
+    """
+    global _STORED_API
+
+    if tailnet is None:
+        _TOKEN_CACHE.clear()
+    else:
+        _TOKEN_CACHE.pop(tailnet, None)
+
+    _STORED_API = None
+
+
+@dataclass(slots=True, frozen=True)
+class Device:
+    """Tailscale device model.
+
+    A slotted, frozen dataclass: ~3x smaller than a pydantic model per
+    instance and with C-level attribute access, which matters when a
+    tailnet has thousands of devices.
+    """
 
     id: str
     name: str
@@ -20,9 +127,34 @@ class Device(BaseModel):
     last_seen: str
     os: str
     tags: Optional[List[str]] = None
+    # Derived fields, excluded from init/compare: an O(1) membership
+    # index over tags, and the lowercased name so case-insensitive
+    # filters don't re-lower every device per lookup.
+    tag_set: FrozenSet[str] = field(init=False, repr=False, compare=False)
+    name_lower: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # object.__setattr__ because the dataclass is frozen.
+        object.__setattr__(self, "tag_set", frozenset(self.tags or ()))
+        object.__setattr__(self, "name_lower", self.name.lower())
+
 
+class DeviceTuple(NamedTuple):
+    """Lightweight device row for display loops.
 
-class ApiKey(BaseModel):
+    Cheaper to build than Device; used where the consumer only formats
+    fields and never needs tags.
+    """
+
+    id: str
+    name: str
+    ip: str
+    last_seen: str
+    os: str
+
+
+@dataclass(slots=True, frozen=True)
+class ApiKey:
     """Tailscale API key model."""
 
     id: str
@@ -39,6 +171,16 @@ class TailscaleAPI:
     API_BASE_URL = "https://api.tailscale.com/api/v2"
     AUTH_SERVICE_NAME = "tailnet-admin"
 
+    # Device and key lists change slowly; serve cached responses this long
+    # before revalidating (in the background when stale, blocking past that).
+    CACHE_TTL_FRESH = 30.0
+    CACHE_TTL_STALE = 600.0
+
+    # Shared across all instances so repeated API calls in one process reuse
+    # the same pooled TCP+TLS connection instead of paying a fresh handshake
+    # per invocation.
+    _client: Optional[httpx.Client] = None
+
     def __init__(self, tailnet: str, token: Optional[str] = None):
         """Initialize Tailscale API client.
 
@@ -48,27 +190,83 @@ class TailscaleAPI:
         """
         self.tailnet = tailnet
         self.token = token
+        self.client = self._get_client()
 
-        # Configure client with timeouts, retries and headers
-        limits = httpx.Limits(max_keepalive_connections=5, max_connections=10)
-        timeout = httpx.Timeout(10.0, connect=5.0)
-
-        # Create a transport with automatic retries
-        transport = httpx.HTTPTransport(retries=3)
-
-        self.client = httpx.Client(
-            base_url=self.API_BASE_URL,
-            timeout=timeout,
-            limits=limits,
-            transport=transport,
-            headers={
+    @classmethod
+    def _get_client(cls) -> httpx.Client:
+        """Return the shared HTTP client, creating it on first use."""
+        if cls._client is None:
+            # Configure client with timeouts, retries and headers
+            limits = httpx.Limits(
+                max_keepalive_connections=10, keepalive_expiry=60.0
+            )
+            timeout = httpx.Timeout(10.0, connect=5.0)
+            headers = {
                 "User-Agent": f"tailnet-admin/{__import__('tailnet_admin').__version__}",
                 "Accept": "application/json",
-            },
-        )
+                # No explicit Accept-Encoding: httpx advertises exactly the
+                # codecs it can decode (br only with the brotli extra), so
+                # large device lists still compress ~10x without risking a
+                # content-encoding we can't decompress
+            }
+
+            try:
+                # Prefer HTTP/2 so concurrent requests can multiplex over a
+                # single connection.
+                cls._client = httpx.Client(
+                    base_url=cls.API_BASE_URL,
+                    http2=True,
+                    timeout=timeout,
+                    limits=limits,
+                    transport=httpx.HTTPTransport(retries=3, http2=True),
+                    headers=headers,
+                )
+            except ImportError:
+                # The optional 'h2' package is not installed; fall back to
+                # HTTP/1.1 with the same pooling and retry behavior.
+                cls._client = httpx.Client(
+                    base_url=cls.API_BASE_URL,
+                    timeout=timeout,
+                    limits=limits,
+                    transport=httpx.HTTPTransport(retries=3),
+                    headers=headers,
+                )
 
-        if token:
-            self.client.headers.update({"Authorization": f"Bearer {token}"})
+            atexit.register(cls._client.close)
+
+        return cls._client
+
+    @staticmethod
+    def _ensure_json_response(response: httpx.Response) -> None:
+        """Raise if a 2xx response body isn't JSON.
+
+        Proxies and captive portals sometimes return HTML with a 200;
+        checking the Content-Type up front avoids a doomed (and costly)
+        parse attempt.
+
+        Args:
+            response: The HTTP response to check
+
+        Raises:
+            ValueError: If the response is not JSON
+        """
+        content_type = response.headers.get("content-type", "")
+        if "application/json" not in content_type:
+            raise ValueError(
+                f"Expected a JSON response but got '{content_type or 'unknown'}'. "
+                f"A proxy or captive portal may be intercepting API requests."
+            )
+
+    @property
+    def auth_headers(self) -> Dict[str, str]:
+        """Authorization headers for this instance, merged into each request.
+
+        The HTTP client is shared between instances, so auth headers are
+        passed per-request rather than mutated onto the client.
+        """
+        if self.token:
+            return {"Authorization": f"Bearer {self.token}"}
+        return {}
 
     @classmethod
     def from_stored_auth(cls) -> "TailscaleAPI":
@@ -82,24 +280,41 @@ class TailscaleAPI:
         """
         import time
 
-        config_dir = Path.home() / ".config" / "tailnet-admin"
-        config_file = config_dir / "config.json"
+        import keyring
+
+        global _STORED_API
 
-        if not config_file.exists():
+        # Reuse the instance from a previous call while its token is valid
+        if _STORED_API is not None:
+            cached = _TOKEN_CACHE.get(_STORED_API.tailnet)
+            if cached is not None and cached[1] > time.time():
+                return _STORED_API
+            _STORED_API = None
+
+        if not CONFIG_FILE.exists():
             raise ValueError(
                 "No stored authentication found. Run 'tailnet-admin auth' first."
             )
 
-        with open(config_file, "r") as f:
-            config = json.load(f)
+        with open(CONFIG_FILE, "r") as f:
+            config = _json_loads(f.read())
 
         tailnet = config.get("tailnet")
         if not tailnet:
             raise ValueError("Invalid config file. Run 'tailnet-admin auth' again.")
 
-        token = keyring.get_password(cls.AUTH_SERVICE_NAME, tailnet)
-        if not token:
-            raise ValueError("No stored token found. Run 'tailnet-admin auth' again.")
+        # Use the in-process token cache when it hasn't expired, so repeated
+        # instantiations don't pay the keyring backend round-trip.
+        cached = _TOKEN_CACHE.get(tailnet)
+        if cached is not None and cached[1] > time.time():
+            token = cached[0]
+        else:
+            token = keyring.get_password(cls.AUTH_SERVICE_NAME, tailnet)
+            if not token:
+                raise ValueError(
+                    "No stored token found. Run 'tailnet-admin auth' again."
+                )
+            _TOKEN_CACHE[tailnet] = (token, config.get("expires_at", 0))
 
         # Check if token is expired
         if "expires_at" in config:
@@ -123,7 +338,8 @@ class TailscaleAPI:
                     f"Consider running 'tailnet-admin auth' soon to refresh it."
                 )
 
-        return cls(tailnet=tailnet, token=token)
+        _STORED_API = cls(tailnet=tailnet, token=token)
+        return _STORED_API
 
     def authenticate(self, client_id: str, client_secret: str) -> None:
         """Authenticate with Tailscale API using OAuth client credentials flow.
@@ -137,26 +353,27 @@ class TailscaleAPI:
         """
         import time
 
+        import keyring
         from rich.console import Console
 
         console = Console()
 
         try:
-            # Using OAuth 2.0 client credentials grant type
-            # as per https://tailscale.com/kb/1215/oauth-clients#tailscale-oauth-token-endpoint
-            token_endpoint = "https://api.tailscale.com/api/v2/oauth/token"
+            from urllib.parse import urlencode
 
-            # Prepare the request data for client credentials grant
-            data = {
+            # OAuth 2.0 client credentials grant: serialize the form body
+            # once and pass it as content= to skip httpx's form encoder
+            token_data = {
                 "client_id": client_id,
                 "client_secret": client_secret,
                 "grant_type": "client_credentials",
             }
-
-            headers = {"Content-Type": "application/x-www-form-urlencoded"}
+            content = urlencode(token_data).encode()
 
             console.print("Authenticating with Tailscale API...")
-            response = httpx.post(token_endpoint, data=data, headers=headers)
+            response = httpx.post(
+                TOKEN_ENDPOINT, content=content, headers=_FORM_HEADERS
+            )
             response.raise_for_status()
 
             token_info = response.json()
@@ -170,35 +387,40 @@ class TailscaleAPI:
             logging.info(f"OAuth token received with scopes: {scope}")
 
             # Store token and tailnet info securely
-            config_dir = Path.home() / ".config" / "tailnet-admin"
-            config_dir.mkdir(parents=True, exist_ok=True)
+            CONFIG_DIR.mkdir(parents=True, exist_ok=True)
 
             # Tokens expire after 1 hour (3600 seconds) as per Tailscale docs
             expires_in = token_info.get("expires_in", 3600)
             expires_at = time.time() + expires_in
 
-            with open(config_dir / "config.json", "w") as f:
-                json.dump(
-                    {
-                        "tailnet": self.tailnet,
-                        "token_type": token_info.get("token_type", "Bearer"),
-                        "expires_at": expires_at,
-                    },
-                    f,
+            with open(CONFIG_FILE, "w") as f:
+                f.write(
+                    _json_dumps(
+                        {
+                            "tailnet": self.tailnet,
+                            "token_type": token_info.get("token_type", "Bearer"),
+                            "expires_at": expires_at,
+                        }
+                    )
                 )
 
             # Store only the access token in the keyring
             keyring.set_password(self.AUTH_SERVICE_NAME, self.tailnet, token)
 
-            # Update current instance
+            # Seed the in-process cache so from_stored_auth skips the keyring
+            _TOKEN_CACHE[self.tailnet] = (token, expires_at)
+
+            # Update current instance; auth_headers picks up the new token
             self.token = token
-            self.client.headers.update({"Authorization": f"Bearer {token}"})
 
             # Verify the token has the necessary permissions by testing a write operation
             # This helps catch permission issues early
             try:
                 # First get a device to test with
-                devices_response = self.client.get(f"/tailnet/{self.tailnet}/devices")
+                devices_response = self.client.get(
+                    f"/tailnet/{self.tailnet}/devices",
+                    headers=self.auth_headers,
+                )
                 devices_response.raise_for_status()
                 devices = devices_response.json().get("devices", [])
 
@@ -213,6 +435,7 @@ class TailscaleAPI:
                         self.client.post(
                             f"/device/{device_id}/tags",
                             json={"tags": current_tags},
+                            headers=self.auth_headers,
                             timeout=3.0,
                         ).raise_for_status()
                         console.print("[green]✓ Write permissions verified.[/green]")
@@ -302,7 +525,10 @@ class TailscaleAPI:
         # So we need to omit the /api/v2 prefix in the endpoint path
         try:
             # This is the correct endpoint according to Tailscale OAuth docs
-            response = self.client.get(f"/tailnet/{self.tailnet}/keys/{key_id}")
+            response = self.client.get(
+                f"/tailnet/{self.tailnet}/keys/{key_id}",
+                headers=self.auth_headers,
+            )
             response.raise_for_status()
             return response.json()
         except httpx.HTTPStatusError as e:
@@ -317,7 +543,9 @@ class TailscaleAPI:
 
                 for endpoint in try_endpoints:
                     try:
-                        alt_response = self.client.get(endpoint)
+                        alt_response = self.client.get(
+                            endpoint, headers=self.auth_headers
+                        )
                         alt_response.raise_for_status()
                         return alt_response.json()
                     except httpx.HTTPStatusError:
@@ -342,40 +570,113 @@ class TailscaleAPI:
                     f"Error {e.response.status_code} when accessing API key info: {e.response.text}"
                 ) from e
 
+    def _fetch_devices(self, etag: Optional[str] = None):
+        """Fetch the raw device list from the API.
+
+        Sends a conditional GET when a cached ETag is available, so an
+        unchanged tailnet costs a 304 with no body to download or parse.
+
+        Args:
+            etag: ETag from the cached response, if any
+
+        Returns:
+            tuple: (parsed JSON body or None on 304, response ETag or None)
+        """
+        headers = dict(self.auth_headers)
+        if etag:
+            headers["If-None-Match"] = etag
+
+        response = self.client.get(
+            f"/tailnet/{self.tailnet}/devices", headers=headers
+        )
+
+        if response.status_code == 304:
+            return None, etag
+
+        response.raise_for_status()
+        self._ensure_json_response(response)
+
+        return _json_loads(response.content), response.headers.get("etag")
+
     def get_devices(self) -> List[Device]:
         """Get all devices in the tailnet.
 
+        Responses are cached on disk with stale-while-revalidate semantics,
+        so repeated invocations (scripts, completions) skip the network.
+
         Returns:
             List[Device]: List of devices
         """
-        response = self.client.get(f"/tailnet/{self.tailnet}/devices")
-        response.raise_for_status()
-
-        devices_data = response.json().get("devices", [])
+        body = fetch_swr(
+            f"devices:{self.tailnet}",
+            ttl_fresh=self.CACHE_TTL_FRESH,
+            ttl_stale=self.CACHE_TTL_STALE,
+            fetch_fn=self._fetch_devices,
+        )
 
-        # Process the device data to match our model
-        processed_devices = []
-        for device_data in devices_data:
-            # Extract the main IP address (usually the first one)
-            ip = (
-                device_data.get("addresses", [""])[0]
-                if device_data.get("addresses")
-                else ""
+        # Project rows in C via the precompiled jmespath expression when
+        # it's available
+        if _DEV_PROJ is not None:
+            return [Device(**row) for row in _DEV_PROJ.search(body) or []]
+
+        devices_data = body.get("devices", [])
+
+        # Tight comprehension: no intermediate dict per row and one branch
+        # for the primary address
+        return [
+            Device(
+                id=d.get("id", ""),
+                name=d.get("hostname") or d.get("name", ""),
+                ip=(d.get("addresses") or [""])[0],
+                last_seen=d.get("lastSeen", ""),
+                os=d.get("os", ""),
+                tags=d.get("tags", []),
             )
+            for d in devices_data
+        ]
 
-            # Create a simplified device object
-            device = {
-                "id": device_data.get("id", ""),
-                "name": device_data.get("hostname", device_data.get("name", "")),
-                "ip": ip,
-                "last_seen": device_data.get("lastSeen", ""),
-                "os": device_data.get("os", ""),
-                "tags": device_data.get("tags", []),
-            }
+    def iter_device_dicts(self):
+        """Stream raw device entries from the API one row at a time.
+
+        Streams the response body through ijson so a 10k-device tailnet
+        never materializes the full JSON in memory. Falls back to a full
+        parse when ijson isn't installed. Always hits the network (no
+        on-disk caching), since the point is bounding memory, not latency.
+
+        Yields:
+            dict: Raw device entries as returned by the API
+        """
+        if ijson is None:
+            body, _ = self._fetch_devices()
+            yield from body.get("devices", [])
+            return
+
+        with self.client.stream(
+            "GET", f"/tailnet/{self.tailnet}/devices", headers=self.auth_headers
+        ) as response:
+            response.raise_for_status()
+
+            reader = _ByteStreamReader(response.iter_bytes())
+            yield from ijson.items(reader, "devices.item")
+
+    def iter_devices(self) -> Iterator[DeviceTuple]:
+        """Stream devices as lightweight named tuples.
 
-            processed_devices.append(Device(**device))
+        Built on iter_device_dicts, so rows are parsed and yielded one at
+        a time; suited to display loops that don't need the full Device
+        model.
 
-        return processed_devices
+        Yields:
+            DeviceTuple: One row per device
+        """
+        for d in self.iter_device_dicts():
+            yield DeviceTuple(
+                d.get("id", ""),
+                d.get("hostname") or d.get("name", ""),
+                (d.get("addresses") or [""])[0],
+                d.get("lastSeen", ""),
+                d.get("os", ""),
+            )
 
     def get_device(self, device_id: str) -> Device:
         """Get details of a specific device.
@@ -389,10 +690,13 @@ class TailscaleAPI:
         Raises:
             httpx.HTTPStatusError: If the API request fails
         """
-        response = self.client.get(f"/device/{device_id}")
+        response = self.client.get(
+            f"/device/{device_id}", headers=self.auth_headers
+        )
         response.raise_for_status()
+        self._ensure_json_response(response)
 
-        device_data = response.json()
+        device_data = _json_loads(response.content)
 
         # Extract the main IP address (usually the first one)
         ip = (
@@ -429,9 +733,15 @@ class TailscaleAPI:
         data = {"tags": tags}
 
         try:
-            response = self.client.post(f"/device/{device_id}/tags", json=data)
+            response = self.client.post(
+                f"/device/{device_id}/tags", json=data, headers=self.auth_headers
+            )
             response.raise_for_status()
 
+            # The cached device list now holds pre-write tags; drop it so
+            # the next read doesn't serve (or build on) stale data
+            invalidate(f"devices:{self.tailnet}")
+
             # Return the updated device
             return self.get_device(device_id)
 
@@ -452,34 +762,71 @@ class TailscaleAPI:
             else:
                 raise
 
+    def _fetch_keys(self, etag: Optional[str] = None):
+        """Fetch the raw key list from the API.
+
+        Sends a conditional GET when a cached ETag is available, like
+        _fetch_devices.
+
+        Args:
+            etag: ETag from the cached response, if any
+
+        Returns:
+            tuple: (parsed JSON body or None on 304, response ETag or None)
+        """
+        headers = dict(self.auth_headers)
+        if etag:
+            headers["If-None-Match"] = etag
+
+        response = self.client.get(
+            f"/tailnet/{self.tailnet}/keys", headers=headers
+        )
+
+        if response.status_code == 304:
+            return None, etag
+
+        response.raise_for_status()
+        self._ensure_json_response(response)
+
+        return _json_loads(response.content), response.headers.get("etag")
+
     def get_keys(self) -> List[ApiKey]:
         """Get all API keys.
 
+        Responses are cached on disk with stale-while-revalidate semantics,
+        like get_devices.
+
         Returns:
             List[ApiKey]: List of API keys
         """
         try:
-            response = self.client.get(f"/tailnet/{self.tailnet}/keys")
-            response.raise_for_status()
-
-            keys_data = response.json().get("keys", [])
-
-            # Process the key data to match our model
-            processed_keys = []
-            for key_data in keys_data:
-                # Create a key object with all available data
-                key = {
-                    "id": key_data.get("id", ""),
-                    "name": key_data.get("description", key_data.get("name", "")),
-                    "created": key_data.get("created", ""),
-                    "expires": key_data.get("expires", ""),
-                    "capabilities": key_data.get("capabilities", None),
-                    "description": key_data.get("description", ""),
-                }
-
-                processed_keys.append(ApiKey(**key))
+            body = fetch_swr(
+                f"keys:{self.tailnet}",
+                ttl_fresh=self.CACHE_TTL_FRESH,
+                ttl_stale=self.CACHE_TTL_STALE,
+                fetch_fn=self._fetch_keys,
+            )
 
-            return processed_keys
+            # Project rows in C when jmespath is available, as in
+            # get_devices
+            if _KEY_PROJ is not None:
+                return [ApiKey(**row) for row in _KEY_PROJ.search(body) or []]
+
+            keys_data = body.get("keys", [])
+
+            # Construct keys directly from the JSON rows; no intermediate
+            # dict per key (matches the get_devices parse loop)
+            return [
+                ApiKey(
+                    id=k.get("id", ""),
+                    name=k.get("description") or k.get("name", ""),
+                    created=k.get("created", ""),
+                    expires=k.get("expires", ""),
+                    capabilities=k.get("capabilities"),
+                    description=k.get("description", ""),
+                )
+                for k in keys_data
+            ]
 
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 403:
@@ -492,3 +839,21 @@ class TailscaleAPI:
                 raise ValueError(
                     f"Error {e.response.status_code} when listing API keys: {e.response.text}"
                 ) from e
+
+    def get_overview(self) -> "tuple[List[Device], List[ApiKey]]":
+        """Get devices and API keys in parallel.
+
+        The shared HTTP client is thread-safe and pooled, so both requests
+        ride keep-alive connections concurrently instead of paying two
+        sequential round-trips.
+
+        Returns:
+            tuple[List[Device], List[ApiKey]]: (devices, keys)
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            devices_future = executor.submit(self.get_devices)
+            keys_future = executor.submit(self.get_keys)
+
+            return devices_future.result(), keys_future.result()
@@ -0,0 +1,161 @@
+"""On-disk response cache with stale-while-revalidate semantics."""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional, Tuple
+
+# Where cached API responses live. One JSON file per cache key.
+CACHE_DIR = Path.home() / ".cache" / "tailnet-admin"
+
+# A fetch function performs the network request, sending the cached ETag
+# (if any) as a conditional header. It returns the parsed JSON body plus
+# the response ETag; a None body signals 304 Not Modified.
+FetchFn = Callable[[Optional[str]], Tuple[Any, Optional[str]]]
+
+
+def _cache_path(key: str) -> Path:
+    """Return the on-disk path for a cache key.
+
+    Args:
+        key: The cache key (e.g., "devices:example.com")
+
+    Returns:
+        Path: Path to the cache file for this key
+    """
+    digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+    return CACHE_DIR / f"{digest}.json"
+
+
+def load_entry(key: str) -> Optional[dict]:
+    """Load a cache entry from disk.
+
+    Args:
+        key: The cache key
+
+    Returns:
+        Optional[dict]: The cache entry ({timestamp, etag, body}), or None
+        if there is no usable entry for this key
+    """
+    path = _cache_path(key)
+
+    try:
+        with open(path, "r") as f:
+            entry = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+    # Ignore entries that don't look like ours (e.g., older formats)
+    if not isinstance(entry, dict) or "timestamp" not in entry or "body" not in entry:
+        return None
+
+    return entry
+
+
+def store_entry(key: str, body: Any, etag: Optional[str] = None) -> None:
+    """Write a cache entry to disk atomically.
+
+    Args:
+        key: The cache key
+        body: The parsed JSON body to cache
+        etag: The response ETag, if the server provided one
+    """
+    path = _cache_path(key)
+
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+
+        entry = {"timestamp": time.time(), "etag": etag, "body": body}
+
+        # Write to a temp file and rename so readers never see partial JSON
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        # Caching is best-effort; never fail the request over a cache write
+        pass
+
+
+def invalidate(key: str) -> None:
+    """Drop a cache entry, e.g. after a write made it stale.
+
+    Args:
+        key: The cache key
+    """
+    try:
+        os.remove(_cache_path(key))
+    except OSError:
+        # Removal is best-effort, like store_entry; a missing entry is fine
+        pass
+
+
+def _revalidate(key: str, fetch_fn: FetchFn, etag: Optional[str]) -> None:
+    """Refresh a cache entry in the background, swallowing errors."""
+    try:
+        body, new_etag = fetch_fn(etag)
+
+        if body is None:
+            # 304 Not Modified: keep the cached body, refresh the timestamp
+            entry = load_entry(key)
+            if entry is not None:
+                store_entry(key, entry["body"], new_etag or etag)
+            return
+
+        store_entry(key, body, new_etag)
+    except Exception:
+        # Background refresh is opportunistic; the caller already has data
+        pass
+
+
+def fetch_swr(key: str, ttl_fresh: float, ttl_stale: float, fetch_fn: FetchFn) -> Any:
+    """Fetch a JSON body with stale-while-revalidate caching.
+
+    Fresh cache hits are returned without touching the network. Stale (but
+    not expired) hits are returned immediately while a background thread
+    revalidates the entry. Misses block on the network as usual.
+
+    Args:
+        key: The cache key
+        ttl_fresh: Seconds for which a cached entry is served as-is
+        ttl_stale: Seconds for which a cached entry may be served while
+            revalidating in the background
+        fetch_fn: Callable performing the network fetch, returning
+            (parsed body, etag)
+
+    Returns:
+        Any: The parsed JSON body
+    """
+    entry = load_entry(key)
+
+    if entry is not None:
+        age = time.time() - entry["timestamp"]
+
+        if age < ttl_fresh:
+            return entry["body"]
+
+        if age < ttl_stale:
+            # Serve stale data now; refresh it for the next invocation
+            thread = threading.Thread(
+                target=_revalidate,
+                args=(key, fetch_fn, entry.get("etag")),
+                daemon=True,
+            )
+            thread.start()
+            return entry["body"]
+
+    # Cache miss (or entry too old to serve): fetch synchronously. Send the
+    # old ETag so an unchanged list comes back as a body-less 304.
+    etag = entry.get("etag") if entry is not None else None
+    body, new_etag = fetch_fn(etag)
+
+    if body is None and entry is not None:
+        # 304 Not Modified: the cached body is still current
+        store_entry(key, entry["body"], new_etag or etag)
+        return entry["body"]
+
+    store_entry(key, body, new_etag)
+    return body
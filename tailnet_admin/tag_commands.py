@@ -0,0 +1,353 @@
+"""Implementations of the tag management CLI commands.
+
+Kept separate from tag_cli so that registering the subcommands (and
+rendering their --help) never imports the API client or Rich; this module
+is loaded only when a tag command actually runs.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+from tailnet_admin._errors import wrap_errors
+
+if TYPE_CHECKING:
+    from typing import List, Optional
+
+AUTH_HINT = "Try running 'tailnet-admin auth' again."
+
+
+@lru_cache(maxsize=1)
+def _console():
+    """Create the Rich console on first use (see cli._console)."""
+    from rich.console import Console
+
+    return Console()
+
+
+@wrap_errors(hint=AUTH_HINT)
+def list_tags(show_full: bool):
+    """List all tags used in the tailnet and the devices using them."""
+    from collections import defaultdict
+
+    from rich.table import Table
+
+    from tailnet_admin.api import TailscaleAPI
+    from tailnet_admin.tags import get_all_devices_with_tags
+
+    api = TailscaleAPI.from_stored_auth()
+    devices = get_all_devices_with_tags(api)
+
+    # Build the tag-to-devices mapping in a single pass
+    tag_to_devices = defaultdict(list)
+    for device in devices:
+        for tag in device.tags or ():
+            tag_to_devices[tag].append(device)
+
+    if not tag_to_devices:
+        _console().print("[yellow]No tags found in this tailnet.[/yellow]")
+        return
+
+    # Display tags in a table
+    table = Table(title="Tags in your tailnet")
+    table.add_column("Tag", style="cyan")
+    table.add_column("Device Count", style="green")
+    table.add_column("Devices", style="dim")
+
+    for tag, device_list in sorted(tag_to_devices.items()):
+        if show_full:
+            devices_str = ", ".join(d.name for d in device_list)
+        else:
+            devices_str = ", ".join(d.name for d in device_list[:5])
+            if len(device_list) > 5:
+                devices_str += f" and {len(device_list) - 5} more"
+
+        table.add_row(tag, str(len(device_list)), devices_str)
+
+    _console().print(table)
+
+
+@wrap_errors()
+def rename_tag_command(old_tag: str, new_tag: str, act: bool):
+    """Rename a tag on all devices in the tailnet."""
+    from tailnet_admin.api import TailscaleAPI
+    from tailnet_admin.tags import (
+        get_all_devices_with_tags,
+        print_tag_changes,
+        rename_tag,
+    )
+
+    api = TailscaleAPI.from_stored_auth()
+
+    # Fetch the device list once and reuse it for the apply pass
+    devices = get_all_devices_with_tags(api)
+
+    # Get the changes that would be made
+    changes = rename_tag(api, old_tag, new_tag, dry_run=True, devices=devices)
+
+    _console().print(f"[bold]Renaming tag:[/bold] {old_tag} → {new_tag}")
+    print_tag_changes(changes, _console())
+
+    if not changes:
+        return
+
+    if not act:
+        _console().print(
+            "[yellow]Dry run mode. No changes were made. Use --act to apply changes.[/yellow]"
+        )
+        return
+
+    # Apply the changes
+    rename_tag(api, old_tag, new_tag, dry_run=False, devices=devices)
+    _console().print(
+        f"[green]Successfully renamed tag on {len(changes)} devices.[/green]"
+    )
+
+
+@wrap_errors()
+def add_if_has_command(existing_tag: str, new_tag: str, act: bool):
+    """Add a tag to devices that already have another specific tag."""
+    from tailnet_admin.api import TailscaleAPI
+    from tailnet_admin.tags import (
+        add_tag_if_has_tag,
+        get_all_devices_with_tags,
+        print_tag_changes,
+    )
+
+    api = TailscaleAPI.from_stored_auth()
+
+    # Fetch the device list once and reuse it for the apply pass
+    devices = get_all_devices_with_tags(api)
+
+    # Get the changes that would be made
+    changes = add_tag_if_has_tag(
+        api, existing_tag, new_tag, dry_run=True, devices=devices
+    )
+
+    _console().print(
+        f"[bold]Adding tag[/bold] {new_tag} [bold]to devices with tag[/bold] {existing_tag}"
+    )
+    print_tag_changes(changes, _console())
+
+    if not changes:
+        return
+
+    if not act:
+        _console().print(
+            "[yellow]Dry run mode. No changes were made. Use --act to apply changes.[/yellow]"
+        )
+        return
+
+    # Apply the changes
+    add_tag_if_has_tag(api, existing_tag, new_tag, dry_run=False, devices=devices)
+    _console().print(f"[green]Successfully updated {len(changes)} devices.[/green]")
+
+
+@wrap_errors()
+def add_if_missing_command(missing_tag: str, new_tag: str, act: bool):
+    """Add a tag to devices that are missing a specific tag."""
+    from tailnet_admin.api import TailscaleAPI
+    from tailnet_admin.tags import (
+        add_tag_if_missing_tag,
+        get_all_devices_with_tags,
+        print_tag_changes,
+    )
+
+    api = TailscaleAPI.from_stored_auth()
+
+    # Fetch the device list once and reuse it for the apply pass
+    devices = get_all_devices_with_tags(api)
+
+    # Get the changes that would be made
+    changes = add_tag_if_missing_tag(
+        api, missing_tag, new_tag, dry_run=True, devices=devices
+    )
+
+    _console().print(
+        f"[bold]Adding tag[/bold] {new_tag} [bold]to devices without tag[/bold] {missing_tag}"
+    )
+    print_tag_changes(changes, _console())
+
+    if not changes:
+        return
+
+    if not act:
+        _console().print(
+            "[yellow]Dry run mode. No changes were made. Use --act to apply changes.[/yellow]"
+        )
+        return
+
+    # Apply the changes
+    add_tag_if_missing_tag(api, missing_tag, new_tag, dry_run=False, devices=devices)
+    _console().print(f"[green]Successfully updated {len(changes)} devices.[/green]")
+
+
+@wrap_errors()
+def remove_tag_command(tag: str, devices: Optional[List[str]], act: bool):
+    """Remove a tag from devices."""
+    from tailnet_admin.api import TailscaleAPI
+    from tailnet_admin.tags import (
+        get_all_devices_with_tags,
+        print_tag_changes,
+        remove_tag_from_all,
+    )
+
+    api = TailscaleAPI.from_stored_auth()
+
+    # Fetch the device list once and reuse it for the apply pass
+    all_devices = get_all_devices_with_tags(api)
+
+    # Get the changes that would be made
+    changes = remove_tag_from_all(
+        api, tag, device_identifiers=devices, dry_run=True, devices=all_devices
+    )
+
+    if devices:
+        device_str = f"from {len(devices)} specified devices"
+    else:
+        device_str = "from all devices"
+
+    _console().print(f"[bold]Removing tag[/bold] {tag} [bold]{device_str}[/bold]")
+    print_tag_changes(changes, _console())
+
+    if not changes:
+        return
+
+    if not act:
+        _console().print(
+            "[yellow]Dry run mode. No changes were made. Use --act to apply changes.[/yellow]"
+        )
+        return
+
+    # Apply the changes
+    remove_tag_from_all(
+        api, tag, device_identifiers=devices, dry_run=False, devices=all_devices
+    )
+    _console().print(
+        f"[green]Successfully removed tag from {len(changes)} devices.[/green]"
+    )
+
+
+@wrap_errors()
+def set_tags_command(devices: List[str], tags: List[str], act: bool):
+    """Set specific tags for specific devices (replaces all existing tags)."""
+    from tailnet_admin.api import TailscaleAPI
+    from tailnet_admin.tags import (
+        get_all_devices_with_tags,
+        print_tag_changes,
+        set_device_tags,
+    )
+
+    api = TailscaleAPI.from_stored_auth()
+
+    # Fetch the device list once and reuse it for the apply pass
+    all_devices = get_all_devices_with_tags(api)
+
+    # Get the changes that would be made
+    changes = set_device_tags(api, devices, tags, dry_run=True, devices=all_devices)
+
+    tag_list = ", ".join(tags) if tags else "none"
+    _console().print(
+        f"[bold]Setting tags for {len(devices)} devices:[/bold] {tag_list}"
+    )
+    print_tag_changes(changes, _console())
+
+    if not changes:
+        return
+
+    if not act:
+        _console().print(
+            "[yellow]Dry run mode. No changes were made. Use --act to apply changes.[/yellow]"
+        )
+        return
+
+    # Apply the changes
+    set_device_tags(api, devices, tags, dry_run=False, devices=all_devices)
+    _console().print(f"[green]Successfully updated {len(changes)} devices.[/green]")
+
+
+@wrap_errors()
+def add_tags_command(devices: List[str], tags: List[str], act: bool):
+    """Add tags to specific devices (preserves existing tags)."""
+    from tailnet_admin.api import TailscaleAPI
+    from tailnet_admin.tags import (
+        add_tags_to_devices,
+        get_all_devices_with_tags,
+        print_tag_changes,
+    )
+
+    api = TailscaleAPI.from_stored_auth()
+
+    # Fetch the device list once and reuse it for the apply pass
+    all_devices = get_all_devices_with_tags(api)
+
+    # Get the changes that would be made
+    changes = add_tags_to_devices(
+        api, devices, tags, dry_run=True, devices=all_devices
+    )
+
+    tag_list = ", ".join(tags) if tags else "none"
+    _console().print(f"[bold]Adding tags to {len(devices)} devices:[/bold] {tag_list}")
+    print_tag_changes(changes, _console())
+
+    if not changes:
+        return
+
+    if not act:
+        _console().print(
+            "[yellow]Dry run mode. No changes were made. Use --act to apply changes.[/yellow]"
+        )
+        return
+
+    # Apply the changes
+    add_tags_to_devices(api, devices, tags, dry_run=False, devices=all_devices)
+    _console().print(f"[green]Successfully updated {len(changes)} devices.[/green]")
+
+
+@wrap_errors(hint=AUTH_HINT)
+def device_tags_command(name_filter: Optional[str], tag_filter: Optional[str]):
+    """List all devices with their tags."""
+    import sys
+
+    from tailnet_admin.api import TailscaleAPI
+    from tailnet_admin.tags import get_all_devices_with_tags, normalize_tag
+
+    api = TailscaleAPI.from_stored_auth()
+    devices = get_all_devices_with_tags(api)
+
+    # Apply filters if provided
+    if name_filter:
+        name_filter = name_filter.lower()
+        devices = [d for d in devices if name_filter in d.name_lower]
+
+    if tag_filter:
+        normalized_tag_filter = normalize_tag(tag_filter)
+        devices = [d for d in devices if normalized_tag_filter in d.tag_set]
+
+    # When piped (to grep, awk, ...), skip Rich entirely and emit
+    # plain TSV — table rendering dominates the command's runtime on
+    # large tailnets and the styling is lost downstream anyway.
+    if not sys.stdout.isatty():
+        sys.stdout.writelines(
+            f"{d.name}\t{d.id}\t{','.join(d.tags or ())}\n" for d in devices
+        )
+        return
+
+    if not devices:
+        _console().print("[yellow]No devices found matching the filters.[/yellow]")
+        return
+
+    from rich.table import Table
+
+    # Display devices in a table
+    table = Table(title="Devices and Tags")
+    table.add_column("Device Name", style="cyan")
+    table.add_column("Device ID", style="dim")
+    table.add_column("Tags", style="green")
+
+    for device in devices:
+        tags_str = ", ".join(device.tags) if device.tags else "[dim]none[/dim]"
+        table.add_row(device.name, device.id, tags_str)
+
+    _console().print(table)
@@ -1,11 +1,21 @@
 """Tag management functions for tailnet-admin."""
 
-from typing import Dict, List, Optional, Set, Tuple, Union
-from rich.console import Console
-from rich.table import Table
-from rich.prompt import Confirm
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, List, Optional, Tuple, TypeAlias
+
+import httpx
 
 from tailnet_admin.api import TailscaleAPI, Device
+from tailnet_admin.cache import invalidate
+
+if TYPE_CHECKING:
+    from rich.console import Console
+
+# A (device, old_tags, new_tags) row, as returned by the bulk mutation
+# functions and consumed by print_tag_changes.
+TagChange: TypeAlias = Tuple[Device, List[str], List[str]]
 
 
 def normalize_tag(tag: str) -> str:
@@ -34,24 +44,29 @@ def normalize_tags(tags: List[str]) -> List[str]:
     return [normalize_tag(tag) for tag in tags]
 
 
-def resolve_device_identifiers(api: TailscaleAPI, identifiers: List[str]) -> List[str]:
+def resolve_device_identifiers(
+    api: TailscaleAPI,
+    identifiers: List[str],
+    devices: Optional[List[Device]] = None,
+) -> List[str]:
     """Resolve device names or IDs to device IDs.
-    
+
     Args:
         api: TailscaleAPI instance
         identifiers: List of device names or IDs
-        
+        devices: Already-fetched device list to reuse (fetched if omitted)
+
     Returns:
         List[str]: List of device IDs
-        
+
     Raises:
         ValueError: If a device identifier cannot be resolved
     """
     # Get all devices for reference
-    all_devices = get_all_devices_with_tags(api)
-    
+    all_devices = devices if devices is not None else get_all_devices_with_tags(api)
+
     # Create name to ID mapping
-    name_to_id = {device.name.lower(): device.id for device in all_devices}
+    name_to_id = {device.name_lower: device.id for device in all_devices}
     id_to_device = {device.id: device for device in all_devices}
     
     # Resolve identifiers
@@ -101,7 +116,7 @@ def find_devices_with_tag(devices: List[Device], tag: str) -> List[Device]:
         List[Device]: List of devices with the tag
     """
     normalized_tag = normalize_tag(tag)
-    return [device for device in devices if device.tags and normalized_tag in device.tags]
+    return [device for device in devices if normalized_tag in device.tag_set]
 
 
 def find_devices_without_tag(devices: List[Device], tag: str) -> List[Device]:
@@ -115,148 +130,255 @@ def find_devices_without_tag(devices: List[Device], tag: str) -> List[Device]:
         List[Device]: List of devices without the tag
     """
     normalized_tag = normalize_tag(tag)
-    return [device for device in devices if not device.tags or normalized_tag not in device.tags]
+    return [device for device in devices if normalized_tag not in device.tag_set]
+
+
+async def _apply_updates(
+    api: TailscaleAPI, updates: List[Tuple[str, List[str]]]
+) -> None:
+    """Apply a batch of tag updates concurrently.
+
+    Each update is a POST like TailscaleAPI.update_device_tags, but the
+    requests are issued in parallel over a shared connection pool so a
+    bulk operation costs roughly one round trip instead of one per device.
+
+    Args:
+        api: TailscaleAPI instance (for base URL and auth headers)
+        updates: List of (device_id, new_tags) pairs to apply
+
+    Raises:
+        ValueError: If any update fails; the message lists the failed
+            device IDs (sibling updates still run to completion)
+    """
+    limits = httpx.Limits(max_keepalive_connections=20, max_connections=20)
+    timeout = httpx.Timeout(10.0, connect=5.0)
+
+    async with httpx.AsyncClient(
+        base_url=api.API_BASE_URL,
+        timeout=timeout,
+        limits=limits,
+        headers=api.auth_headers,
+    ) as client:
+
+        async def _post(device_id: str, tags: List[str]) -> None:
+            response = await client.post(
+                f"/device/{device_id}/tags", json={"tags": tags}
+            )
+            if response.status_code == 403:
+                raise ValueError(
+                    f"Permission denied (403): You don't have write permission "
+                    f"to update tags. Check that your OAuth client has the "
+                    f"'devices:write' scope. Details: {response.text}"
+                )
+            response.raise_for_status()
+
+        # return_exceptions so one failed POST doesn't cancel its
+        # siblings mid-flight, leaving an unknown subset applied
+        results = await asyncio.gather(
+            *(_post(device_id, tags) for device_id, tags in updates),
+            return_exceptions=True,
+        )
+
+    failures = [
+        (device_id, error)
+        for (device_id, _), error in zip(updates, results)
+        if isinstance(error, BaseException)
+    ]
+    if failures:
+        details = "; ".join(f"{device_id}: {error}" for device_id, error in failures)
+        raise ValueError(
+            f"Failed to update tags on {len(failures)} of {len(updates)} "
+            f"devices: {details}"
+        )
+
+
+def apply_tag_updates(
+    api: TailscaleAPI, updates: List[Tuple[str, List[str]]]
+) -> None:
+    """Apply queued (device_id, new_tags) updates in one concurrent batch.
+
+    Args:
+        api: TailscaleAPI instance
+        updates: List of (device_id, new_tags) pairs to apply
+    """
+    if not updates:
+        return
+    try:
+        asyncio.run(_apply_updates(api, updates))
+    finally:
+        # Even a partial apply leaves the cached device list holding
+        # pre-write tags; drop it so the next read refetches
+        invalidate(f"devices:{api.tailnet}")
 
 
 def rename_tag(
-    api: TailscaleAPI, old_tag: str, new_tag: str, dry_run: bool = False
-) -> List[Tuple[Device, List[str], List[str]]]:
+    api: TailscaleAPI,
+    old_tag: str,
+    new_tag: str,
+    dry_run: bool = False,
+    devices: Optional[List[Device]] = None,
+) -> List[TagChange]:
     """Rename a tag on all devices.
-    
+
     Args:
         api: TailscaleAPI instance
         old_tag: Tag to rename
         new_tag: New tag name
         dry_run: If True, don't actually update tags
-        
+        devices: Already-fetched device list to reuse (fetched if omitted)
+
     Returns:
-        List[Tuple[Device, List[str], List[str]]]: List of (device, old_tags, new_tags) tuples
+        List[TagChange]: List of (device, old_tags, new_tags) tuples
     """
     # Normalize tags
     normalized_old_tag = normalize_tag(old_tag)
     normalized_new_tag = normalize_tag(new_tag)
-    
-    devices = get_all_devices_with_tags(api)
+
+    if devices is None:
+        devices = get_all_devices_with_tags(api)
     affected_devices = find_devices_with_tag(devices, normalized_old_tag)
     
     results = []
-    
+    updates = []
+
     for device in affected_devices:
         old_tags = device.tags or []
         new_tags = [normalized_new_tag if tag == normalized_old_tag else tag for tag in old_tags]
-        
-        if not dry_run:
-            api.update_device_tags(device.id, new_tags)
-        
+
+        updates.append((device.id, new_tags))
         results.append((device, old_tags, new_tags))
-    
+
+    if not dry_run:
+        apply_tag_updates(api, updates)
+
     return results
 
 
 def add_tag_if_has_tag(
-    api: TailscaleAPI, existing_tag: str, new_tag: str, dry_run: bool = False
-) -> List[Tuple[Device, List[str], List[str]]]:
+    api: TailscaleAPI,
+    existing_tag: str,
+    new_tag: str,
+    dry_run: bool = False,
+    devices: Optional[List[Device]] = None,
+) -> List[TagChange]:
     """Add a tag to devices that have another specific tag.
-    
+
     Args:
         api: TailscaleAPI instance
         existing_tag: Tag that must be present
         new_tag: Tag to add
         dry_run: If True, don't actually update tags
-        
+        devices: Already-fetched device list to reuse (fetched if omitted)
+
     Returns:
-        List[Tuple[Device, List[str], List[str]]]: List of (device, old_tags, new_tags) tuples
+        List[TagChange]: List of (device, old_tags, new_tags) tuples
     """
     # Normalize tags
     normalized_existing_tag = normalize_tag(existing_tag)
     normalized_new_tag = normalize_tag(new_tag)
-    
-    devices = get_all_devices_with_tags(api)
+
+    if devices is None:
+        devices = get_all_devices_with_tags(api)
     affected_devices = find_devices_with_tag(devices, normalized_existing_tag)
     
     results = []
-    
+    updates = []
+
     for device in affected_devices:
         old_tags = device.tags or []
-        
-        if normalized_new_tag not in old_tags:
-            new_tags = old_tags + [normalized_new_tag]
-            
-            if not dry_run:
-                api.update_device_tags(device.id, new_tags)
-        else:
-            # Tag already exists, no change needed
-            new_tags = old_tags
-        
+
+        if normalized_new_tag in device.tag_set:
+            # Tag already exists; not a change, so don't report it
+            continue
+
+        new_tags = old_tags + [normalized_new_tag]
+        updates.append((device.id, new_tags))
         results.append((device, old_tags, new_tags))
-    
+
+    if not dry_run:
+        apply_tag_updates(api, updates)
+
     return results
 
 
 def add_tag_if_missing_tag(
-    api: TailscaleAPI, missing_tag: str, new_tag: str, dry_run: bool = False
-) -> List[Tuple[Device, List[str], List[str]]]:
+    api: TailscaleAPI,
+    missing_tag: str,
+    new_tag: str,
+    dry_run: bool = False,
+    devices: Optional[List[Device]] = None,
+) -> List[TagChange]:
     """Add a tag to devices that are missing a specific tag.
-    
+
     Args:
         api: TailscaleAPI instance
         missing_tag: Tag that must be absent
         new_tag: Tag to add
         dry_run: If True, don't actually update tags
-        
+        devices: Already-fetched device list to reuse (fetched if omitted)
+
     Returns:
-        List[Tuple[Device, List[str], List[str]]]: List of (device, old_tags, new_tags) tuples
+        List[TagChange]: List of (device, old_tags, new_tags) tuples
     """
     # Normalize tags
     normalized_missing_tag = normalize_tag(missing_tag)
     normalized_new_tag = normalize_tag(new_tag)
-    
-    devices = get_all_devices_with_tags(api)
+
+    if devices is None:
+        devices = get_all_devices_with_tags(api)
     affected_devices = find_devices_without_tag(devices, normalized_missing_tag)
     
     results = []
-    
+    updates = []
+
     for device in affected_devices:
         old_tags = device.tags or []
-        
-        if normalized_new_tag not in old_tags:
-            new_tags = old_tags + [normalized_new_tag]
-            
-            if not dry_run:
-                api.update_device_tags(device.id, new_tags)
-        else:
-            # Tag already exists, no change needed
-            new_tags = old_tags
-        
+
+        if normalized_new_tag in device.tag_set:
+            # Tag already exists; not a change, so don't report it
+            continue
+
+        new_tags = old_tags + [normalized_new_tag]
+        updates.append((device.id, new_tags))
         results.append((device, old_tags, new_tags))
-    
+
+    if not dry_run:
+        apply_tag_updates(api, updates)
+
     return results
 
 
 def remove_tag_from_all(
-    api: TailscaleAPI, tag: str, device_identifiers: Optional[List[str]] = None, dry_run: bool = False
-) -> List[Tuple[Device, List[str], List[str]]]:
+    api: TailscaleAPI,
+    tag: str,
+    device_identifiers: Optional[List[str]] = None,
+    dry_run: bool = False,
+    devices: Optional[List[Device]] = None,
+) -> List[TagChange]:
     """Remove a tag from all devices or specified devices.
-    
+
     Args:
         api: TailscaleAPI instance
         tag: Tag to remove
         device_identifiers: Optional list of device names or IDs to restrict to
         dry_run: If True, don't actually update tags
-        
+        devices: Already-fetched device list to reuse (fetched if omitted)
+
     Returns:
-        List[Tuple[Device, List[str], List[str]]]: List of (device, old_tags, new_tags) tuples
+        List[TagChange]: List of (device, old_tags, new_tags) tuples
     """
     # Normalize tag
     normalized_tag = normalize_tag(tag)
-    
+
     # Get all devices
-    all_devices = get_all_devices_with_tags(api)
+    all_devices = devices if devices is not None else get_all_devices_with_tags(api)
     
     # Filter to specific devices if provided
     if device_identifiers:
         # Resolve device identifiers to IDs
-        device_ids = resolve_device_identifiers(api, device_identifiers)
+        device_ids = resolve_device_identifiers(
+            api, device_identifiers, devices=all_devices
+        )
         # Filter devices to only those in the list
         devices = [d for d in all_devices if d.id in device_ids]
     else:
@@ -266,106 +388,128 @@ def remove_tag_from_all(
     affected_devices = find_devices_with_tag(devices, normalized_tag)
     
     results = []
-    
+    updates = []
+
     for device in affected_devices:
         old_tags = device.tags or []
         new_tags = [t for t in old_tags if t != normalized_tag]
-        
-        if not dry_run:
-            api.update_device_tags(device.id, new_tags)
-        
+
+        updates.append((device.id, new_tags))
         results.append((device, old_tags, new_tags))
-    
+
+    if not dry_run:
+        apply_tag_updates(api, updates)
+
     return results
 
 
 def add_tags_to_devices(
-    api: TailscaleAPI, device_identifiers: List[str], tags: List[str], dry_run: bool = False
-) -> List[Tuple[Device, List[str], List[str]]]:
+    api: TailscaleAPI,
+    device_identifiers: List[str],
+    tags: List[str],
+    dry_run: bool = False,
+    devices: Optional[List[Device]] = None,
+) -> List[TagChange]:
     """Add tags to specific devices.
-    
+
     Args:
         api: TailscaleAPI instance
         device_identifiers: List of device names or IDs
         tags: List of tags to add
         dry_run: If True, don't actually update tags
-        
+        devices: Already-fetched device list to reuse (fetched if omitted)
+
     Returns:
-        List[Tuple[Device, List[str], List[str]]]: List of (device, old_tags, new_tags) tuples
+        List[TagChange]: List of (device, old_tags, new_tags) tuples
     """
-    # Resolve device identifiers to IDs
-    device_ids = resolve_device_identifiers(api, device_identifiers)
-    
+    # One bulk fetch covers both identifier resolution and the per-device
+    # tag lookups; the old per-ID get_device calls were N round-trips.
+    all_devices = devices if devices is not None else get_all_devices_with_tags(api)
+    device_ids = resolve_device_identifiers(
+        api, device_identifiers, devices=all_devices
+    )
+    id_to_device = {device.id: device for device in all_devices}
+
     # Normalize tags
     normalized_tags = normalize_tags(tags)
-    
+
     results = []
-    
+    updates = []
+
     for device_id in device_ids:
-        try:
-            device = api.get_device(device_id)
-            old_tags = device.tags or []
-            
-            # Add new tags without duplicates
-            new_tags = list(old_tags)
-            for tag in normalized_tags:
-                if tag not in new_tags:
-                    new_tags.append(tag)
-            
-            if not dry_run:
-                api.update_device_tags(device_id, new_tags)
-            
-            results.append((device, old_tags, new_tags))
-        except Exception as e:
-            print(f"Error updating device {device_id}: {str(e)}")
-    
+        device = id_to_device[device_id]
+        old_tags = device.tags or []
+
+        # Add new tags without duplicates
+        new_tags = list(old_tags)
+        for tag in normalized_tags:
+            if tag not in new_tags:
+                new_tags.append(tag)
+
+        updates.append((device_id, new_tags))
+        results.append((device, old_tags, new_tags))
+
+    if not dry_run:
+        apply_tag_updates(api, updates)
+
     return results
 
 
 def set_device_tags(
-    api: TailscaleAPI, device_identifiers: List[str], tags: List[str], dry_run: bool = False
-) -> List[Tuple[Device, List[str], List[str]]]:
+    api: TailscaleAPI,
+    device_identifiers: List[str],
+    tags: List[str],
+    dry_run: bool = False,
+    devices: Optional[List[Device]] = None,
+) -> List[TagChange]:
     """Set specific tags for specific devices (replaces all existing tags).
-    
+
     Args:
         api: TailscaleAPI instance
         device_identifiers: List of device names or IDs
         tags: List of tags to set
         dry_run: If True, don't actually update tags
-        
+        devices: Already-fetched device list to reuse (fetched if omitted)
+
     Returns:
-        List[Tuple[Device, List[str], List[str]]]: List of (device, old_tags, new_tags) tuples
+        List[TagChange]: List of (device, old_tags, new_tags) tuples
     """
-    # Resolve device identifiers to IDs
-    device_ids = resolve_device_identifiers(api, device_identifiers)
-    
+    # One bulk fetch covers both identifier resolution and the per-device
+    # tag lookups (see add_tags_to_devices).
+    all_devices = devices if devices is not None else get_all_devices_with_tags(api)
+    device_ids = resolve_device_identifiers(
+        api, device_identifiers, devices=all_devices
+    )
+    id_to_device = {device.id: device for device in all_devices}
+
     # Normalize tags
     normalized_tags = normalize_tags(tags)
-    
+
     results = []
-    
+    updates = []
+
     for device_id in device_ids:
-        try:
-            device = api.get_device(device_id)
-            old_tags = device.tags or []
-            
-            if not dry_run:
-                api.update_device_tags(device_id, normalized_tags)
-            
-            results.append((device, old_tags, normalized_tags))
-        except Exception as e:
-            print(f"Error updating device {device_id}: {str(e)}")
-    
+        device = id_to_device[device_id]
+        old_tags = device.tags or []
+
+        updates.append((device_id, normalized_tags))
+        results.append((device, old_tags, normalized_tags))
+
+    if not dry_run:
+        apply_tag_updates(api, updates)
+
     return results
 
 
-def print_tag_changes(changes: List[Tuple[Device, List[str], List[str]]], console: Console):
+def print_tag_changes(changes: List[TagChange], console: Console):
     """Print tag changes in a table format with color-coded diffs.
     
     Args:
         changes: List of (device, old_tags, new_tags) tuples
         console: Rich console for output
     """
+    from rich.table import Table
+
     if not changes:
         console.print("[yellow]No devices would be affected by this operation.[/yellow]")
         return
@@ -422,13 +566,14 @@ def print_tag_changes(changes: List[Tuple[Device, List[str], List[str]]], consol
     console.print(f"[bold]{len(changes)}[/bold] devices would be affected.")
 
 
-def confirm_changes(console: Console) -> bool:
+def confirm_changes() -> bool:
     """Ask for confirmation before applying changes.
-    
-    Args:
-        console: Rich console for output
-        
+
+    A plain input() prompt; rich.prompt would drag in another Rich
+    submodule just to read y/n.
+
     Returns:
         bool: True if user confirmed, False otherwise
     """
-    return Confirm.ask("Do you want to apply these changes?")
\ No newline at end of file
+    answer = input("Do you want to apply these changes? [y/N]: ")
+    return answer.strip().lower() in ("y", "yes")
\ No newline at end of file